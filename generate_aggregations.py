@@ -8,6 +8,7 @@ all aggregations.
 
 Usage:
     python3 generate_aggregations.py
+    python3 generate_aggregations.py --force   # regenerate even if the CSV is unchanged
     
     Or make it executable and run directly:
     chmod +x generate_aggregations.py
@@ -18,12 +19,22 @@ Requirements:
     - CSV file: ticket-list-export.csv (in project root)
 """
 
+import argparse
+import hashlib
+import io
+import json
+import os
 import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
-# Import the processing module
-from scripts import process_csv
+# Project root (directory containing this script)
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# Fingerprint of the last successful run, stored in the output directory
+CACHE_FILENAME = '.agg-cache.json'
 
 # Color codes for terminal output
 class Colors:
@@ -34,27 +45,48 @@ class Colors:
     BOLD = '\033[1m'
     END = '\033[0m'
 
+# Disable colors once at import when output is piped or NO_COLOR is set
+if not sys.stdout.isatty() or os.environ.get('NO_COLOR'):
+    for _attr in ('GREEN', 'RED', 'YELLOW', 'BLUE', 'BOLD', 'END'):
+        setattr(Colors, _attr, '')
+
+# Colored prefixes and dividers, built once after color selection
+_P_SUCCESS = f"{Colors.GREEN}✓{Colors.END}"
+_P_ERROR = f"{Colors.RED}✗{Colors.END}"
+_P_WARN = f"{Colors.YELLOW}⚠{Colors.END}"
+_P_STEP = f"{Colors.BOLD}[Step %d]{Colors.END} %s"
+_DIVIDER_BLUE = f"{Colors.BOLD}{Colors.BLUE}{'='*70}{Colors.END}"
+_DIVIDER_GREEN = f"{Colors.BOLD}{Colors.GREEN}{'='*70}{Colors.END}"
+_DIVIDER_DASH = f"{Colors.BLUE}{'-'*70}{Colors.END}"
+_DIVIDER_PLAIN = f"{Colors.BLUE}{'='*70}{Colors.END}"
+
+def _emit(*lines, file=None):
+    """Write several lines to file (default stdout) with a single write call"""
+    (file or sys.stdout).write('\n'.join(lines) + '\n')
+
 def print_header():
     """Print script header"""
-    print(f"\n{Colors.BOLD}{Colors.BLUE}{'='*70}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.BLUE}  AMC Analytics Dashboard - Aggregation Generator{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{'='*70}{Colors.END}\n")
+    _emit(
+        f"\n{_DIVIDER_BLUE}",
+        f"{Colors.BOLD}{Colors.BLUE}  AMC Analytics Dashboard - Aggregation Generator{Colors.END}",
+        f"{_DIVIDER_BLUE}\n"
+    )
 
-def print_step(step_num, message):
+def print_step(step_num, message, file=None):
     """Print a step message"""
-    print(f"{Colors.BOLD}[Step {step_num}]{Colors.END} {message}")
+    print(_P_STEP % (step_num, message), file=file)
 
-def print_success(message):
+def print_success(message, file=None):
     """Print success message"""
-    print(f"{Colors.GREEN}✓{Colors.END} {message}")
+    print(_P_SUCCESS, message, file=file)
 
-def print_error(message):
+def print_error(message, file=None):
     """Print error message"""
-    print(f"{Colors.RED}✗{Colors.END} {message}")
+    print(_P_ERROR, message, file=file)
 
-def print_warning(message):
+def print_warning(message, file=None):
     """Print warning message"""
-    print(f"{Colors.YELLOW}⚠{Colors.END} {message}")
+    print(_P_WARN, message, file=file)
 
 def check_python_version():
     """Check if Python version is 3.8 or higher"""
@@ -66,58 +98,121 @@ def check_python_version():
     print_success(f"Python {version.major}.{version.minor}.{version.micro} detected")
     return True
 
-def check_csv_file():
-    """Check if CSV file exists"""
-    print_step(2, "Checking for CSV file...")
-    script_dir = Path(__file__).parent
-    csv_path = script_dir / 'ticket-list-export.csv'
+def check_csv_file(out=None):
+    """Check if CSV file exists (messages go to out, default stdout)"""
+    print_step(2, "Checking for CSV file...", file=out)
+    csv_path = SCRIPT_DIR / 'ticket-list-export.csv'
     
-    if not csv_path.exists():
-        print_error(f"CSV file not found: {csv_path}")
-        print_warning("Please ensure 'ticket-list-export.csv' is in the project root directory")
+    # Stat once (doubles as the existence check); size and mtime are reused for the summary
+    try:
+        csv_stat = os.stat(csv_path)
+    except FileNotFoundError:
+        print_error(f"CSV file not found: {csv_path}", file=out)
+        print_warning("Please ensure 'ticket-list-export.csv' is in the project root directory", file=out)
         return None
     
     # Get file size
-    file_size = csv_path.stat().st_size
+    file_size = csv_stat.st_size
     file_size_mb = file_size / (1024 * 1024)
     
-    print_success(f"CSV file found: {csv_path}")
-    print(f"  File size: {file_size_mb:.2f} MB")
+    print_success(f"CSV file found: {csv_path}", file=out)
     
     # Get last modified time
-    mtime = csv_path.stat().st_mtime
-    mod_time = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
-    print(f"  Last modified: {mod_time}")
+    mtime = csv_stat.st_mtime
+    mod_time = datetime.fromtimestamp(mtime).isoformat(sep=' ', timespec='seconds')
+    _emit(
+        f"  File size: {file_size_mb:.2f} MB",
+        f"  Last modified: {mod_time}",
+        file=out
+    )
     
-    return csv_path
+    return csv_path, csv_stat
+
+def scan_output_directory():
+    """Count existing JSON files in the output directory (None if it does not exist)
 
-def check_output_directory():
-    """Check and create output directory if needed"""
+    Read-only, so it can run alongside the CSV check without creating
+    anything before that check has passed.
+    """
+    try:
+        return _count_json_files(SCRIPT_DIR / 'data')
+    except FileNotFoundError:
+        return None
+
+def check_output_directory(scan=None, overwrite=True):
+    """Check and create output directory if needed
+
+    scan is a future of scan_output_directory() started earlier; without
+    it the directory is scanned here. overwrite is False on a cache hit,
+    when step 4 leaves the existing files alone.
+    """
     print_step(3, "Checking output directory...")
-    script_dir = Path(__file__).parent
-    output_dir = script_dir / 'data'
+    output_dir = SCRIPT_DIR / 'data'
+    json_count = scan.result() if scan is not None else scan_output_directory()
     
-    if not output_dir.exists():
+    if json_count is None:
         output_dir.mkdir(parents=True, exist_ok=True)
         print_success(f"Created output directory: {output_dir}")
     else:
-        # Count existing JSON files
-        json_files = list(output_dir.glob('*.json'))
         print_success(f"Output directory exists: {output_dir}")
-        print(f"  Existing JSON files: {len(json_files)}")
-        if json_files:
+        print(f"  Existing JSON files: {json_count}")
+        if json_count and overwrite:
             print_warning("Existing JSON files will be overwritten")
     
     return output_dir
 
-def run_aggregation():
-    """Run the aggregation process"""
+def csv_fingerprint(csv_path, csv_stat):
+    """Build a cheap fingerprint of the CSV and the aggregation code
+
+    Uses size, mtime and a hash of the first 1 MB of the CSV, plus the
+    size/mtime of process_csv.py so logic changes also trigger a rerun.
+    """
+    with open(csv_path, 'rb') as f:
+        head_digest = hashlib.blake2b(f.read(1 << 20), digest_size=16).hexdigest()
+    script_stat = os.stat(SCRIPT_DIR / 'scripts' / 'process_csv.py')
+    return [
+        csv_stat.st_size,
+        csv_stat.st_mtime_ns,
+        head_digest,
+        script_stat.st_size,
+        script_stat.st_mtime_ns
+    ]
+
+def load_cache(output_dir):
+    """Load the fingerprint of the last successful run, if any"""
+    try:
+        with open(output_dir / CACHE_FILENAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_cache(output_dir, key, file_count):
+    """Record the fingerprint of a successful run"""
+    with open(output_dir / CACHE_FILENAME, 'w', encoding='utf-8') as f:
+        json.dump({'key': key, 'file_count': file_count}, f)
+
+def cached_outputs(cache, key, output_dir):
+    """Return the output scan if the cached run matches key and its files are still present"""
+    if not cache or cache.get('key') != key:
+        return None
+    outputs = _scan_outputs(output_dir)
+    names, name_set = outputs
+    if 'metadata.json' not in name_set or len(names) != cache.get('file_count'):
+        return None
+    return outputs
+
+def run_aggregation(csv_path, output_dir):
+    """Run the aggregation process and return the number of files generated"""
     print_step(4, "Processing CSV and generating aggregations...")
-    script_dir = Path(__file__).parent
-    csv_path = script_dir / 'ticket-list-export.csv'
-    output_dir = script_dir / 'data'
     
-    print(f"{Colors.BLUE}{'-'*70}{Colors.END}\n")
+    # Import the processing module lazily so preflight checks and --help stay fast
+    try:
+        from scripts import process_csv
+    except ImportError as e:
+        print_error(f"Missing dependency: {e}")
+        return None
+    
+    print(f"{_DIVIDER_DASH}\n")
     
     try:
         # Process CSV file
@@ -128,107 +223,157 @@ def run_aggregation():
         print("\nGenerating aggregated JSON files...")
         file_count = process_csv.generate_all_aggregations(data, output_dir)
         
-        print(f"\n{Colors.BLUE}{'-'*70}{Colors.END}")
+        print(f"\n{_DIVIDER_DASH}")
         print_success(f"Aggregation completed successfully - Generated {file_count} files")
-        return True
+        return file_count
         
     except FileNotFoundError as e:
         print_error(f"File not found: {e}")
-        return False
+        return None
     except Exception as e:
         print_error(f"Error during aggregation: {e}")
-        import traceback
         traceback.print_exc()
-        return False
+        return None
+
+def _is_json_output(entry):
+    """Check if a scandir entry is a generated JSON file (dotfiles excluded)"""
+    name = entry.name
+    return name.endswith('.json') and not name.startswith('.') and entry.is_file()
+
+def _json_names(directory):
+    """List generated JSON file names in directory with a single scandir pass"""
+    with os.scandir(directory) as entries:
+        return [e.name for e in entries if _is_json_output(e)]
+
+def _count_json_files(directory):
+    """Count generated JSON files in directory without building a list"""
+    with os.scandir(directory) as entries:
+        return sum(1 for e in entries if _is_json_output(e))
 
-def verify_output():
-    """Verify that output files were generated"""
+def _scan_outputs(output_dir):
+    """Scan output directory once and return (names, name_set) of JSON files"""
+    names = _json_names(output_dir)
+    return names, set(names)
+
+def verify_output(output_dir, outputs=None):
+    """Verify that output files were generated (outputs: optional existing scan)"""
     print_step(5, "Verifying output files...")
-    script_dir = Path(__file__).parent
-    output_dir = script_dir / 'data'
+    
+    # Scan output directory once (unless already scanned) and classify files by name
+    if outputs is None:
+        outputs = _scan_outputs(output_dir)
+    names, name_set = outputs
     
     # Check for metadata.json
-    metadata_file = output_dir / 'metadata.json'
-    if not metadata_file.exists():
+    if 'metadata.json' not in name_set:
         print_error("metadata.json not found")
-        return False
+        return None
     
     print_success("metadata.json found")
     
     # Count JSON files
-    json_files = list(output_dir.glob('*.json'))
-    print_success(f"Total JSON files generated: {len(json_files)}")
-    
-    # Check for customer distribution files
-    customer_dist_files = list(output_dir.glob('customer-distribution-*.json'))
-    if customer_dist_files:
-        print_success(f"Customer distribution files: {len(customer_dist_files)}")
-    
-    # Check for team performance files
-    team_perf_files = list(output_dir.glob('team-performance-*.json'))
-    if team_perf_files:
-        print_success(f"Team performance files: {len(team_perf_files)}")
-    
-    # Check for period files
-    weekly_files = list(output_dir.glob('weekly-*.json'))
-    monthly_files = list(output_dir.glob('monthly-*.json'))
-    if weekly_files:
-        print_success(f"Weekly aggregation files: {len(weekly_files)}")
-    if monthly_files:
-        print_success(f"Monthly aggregation files: {len(monthly_files)}")
-    
-    return True
-
-def print_summary(csv_path, output_dir):
-    """Print summary of the process"""
-    print(f"\n{Colors.BOLD}{Colors.GREEN}{'='*70}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.GREEN}  Aggregation Complete!{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.GREEN}{'='*70}{Colors.END}\n")
-    
-    print(f"{Colors.BOLD}Input:{Colors.END}")
-    print(f"  CSV File: {csv_path}")
+    print_success(f"Total JSON files generated: {len(names)}")
     
-    print(f"\n{Colors.BOLD}Output:{Colors.END}")
-    print(f"  Data Directory: {output_dir}")
+    # Count files per category from the in-memory name list (no further syscalls)
+    customer_dist_count = sum(1 for n in names if n.startswith('customer-distribution-'))
+    if customer_dist_count:
+        print_success(f"Customer distribution files: {customer_dist_count}")
     
-    json_files = list(output_dir.glob('*.json'))
-    print(f"  Total Files Generated: {len(json_files)}")
+    team_perf_count = sum(1 for n in names if n.startswith('team-performance-'))
+    if team_perf_count:
+        print_success(f"Team performance files: {team_perf_count}")
     
-    print(f"\n{Colors.BOLD}Next Steps:{Colors.END}")
-    print(f"  1. Review the generated JSON files in the 'data' directory")
-    print(f"  2. Test the dashboard locally or deploy to GitHub Pages")
-    print(f"  3. To update data: Replace CSV file and run this script again")
+    weekly_count = sum(1 for n in names if n.startswith('weekly-'))
+    monthly_count = sum(1 for n in names if n.startswith('monthly-'))
+    if weekly_count:
+        print_success(f"Weekly aggregation files: {weekly_count}")
+    if monthly_count:
+        print_success(f"Monthly aggregation files: {monthly_count}")
     
-    print(f"\n{Colors.BLUE}{'='*70}{Colors.END}\n")
+    return outputs
 
-def main():
+def print_summary(csv_path, csv_stat, output_dir, outputs):
+    """Print summary of the process"""
+    names, _ = outputs
+    _emit(
+        f"\n{_DIVIDER_GREEN}",
+        f"{Colors.BOLD}{Colors.GREEN}  Aggregation Complete!{Colors.END}",
+        f"{_DIVIDER_GREEN}\n",
+        
+        f"{Colors.BOLD}Input:{Colors.END}",
+        f"  CSV File: {csv_path}",
+        f"  File size: {csv_stat.st_size / (1024 * 1024):.2f} MB",
+        
+        f"\n{Colors.BOLD}Output:{Colors.END}",
+        f"  Data Directory: {output_dir}",
+        f"  Total Files Generated: {len(names)}",
+        
+        f"\n{Colors.BOLD}Next Steps:{Colors.END}",
+        "  1. Review the generated JSON files in the 'data' directory",
+        "  2. Test the dashboard locally or deploy to GitHub Pages",
+        "  3. To update data: Replace CSV file and run this script again",
+        
+        f"\n{_DIVIDER_PLAIN}\n"
+    )
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Generate all server-side aggregations from the CSV export.')
+    parser.add_argument('--force', action='store_true',
+                        help='regenerate aggregations even if the CSV has not changed since the last run')
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main function"""
+    args = parse_args(argv)
     print_header()
     
     # Step 1: Check Python version
     if not check_python_version():
         sys.exit(1)
     
-    # Step 2: Check CSV file
-    csv_path = check_csv_file()
-    if csv_path is None:
-        sys.exit(1)
-    
-    # Step 3: Check output directory
-    output_dir = check_output_directory()
+    # Steps 2 and 3: check the CSV file while the output directory is
+    # scanned (read-only); the directory is only created once the CSV check
+    # has passed. The CSV check writes to a buffer, flushed in step order.
+    # The cache is consulted in between (also read-only) so step 3 only
+    # warns about overwriting when step 4 will actually regenerate.
+    output_dir = SCRIPT_DIR / 'data'
+    csv_out = io.StringIO()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        csv_future = executor.submit(check_csv_file, csv_out)
+        scan_future = executor.submit(scan_output_directory)
+        csv_check = csv_future.result()
+        sys.stdout.write(csv_out.getvalue())
+        if csv_check is None:
+            sys.exit(1)
+        csv_path, csv_stat = csv_check
+        cache_key = csv_fingerprint(csv_path, csv_stat)
+        outputs = None if args.force else cached_outputs(load_cache(output_dir), cache_key, output_dir)
+        check_output_directory(scan_future, overwrite=outputs is None)
     
-    # Step 4: Run aggregation process
-    if not run_aggregation():
-        print_error("Failed to generate aggregations")
-        sys.exit(1)
+    # Step 4: Run aggregation process (skipped if the CSV is unchanged)
+    if outputs is not None:
+        print_step(4, "Processing CSV and generating aggregations...")
+        print_success("Cache hit, skipping (CSV unchanged since last run; use --force to regenerate)")
+        file_count = None
+    else:
+        file_count = run_aggregation(csv_path, output_dir)
+        if file_count is None:
+            print_error("Failed to generate aggregations")
+            sys.exit(1)
     
-    # Step 5: Verify output
-    if not verify_output():
+    # Step 5: Verify output (a cache hit reuses its directory scan)
+    outputs = verify_output(output_dir, outputs)
+    if outputs is None:
         print_error("Output verification failed")
         sys.exit(1)
     
-    # Print summary
-    print_summary(csv_path, output_dir)
+    # Remember this run so an unchanged CSV can skip regeneration next time
+    if file_count is not None:
+        save_cache(output_dir, cache_key, len(outputs[0]))
+    
+    # Print summary (reuses the directory scan from verification)
+    print_summary(csv_path, csv_stat, output_dir, outputs)
     
     return 0
 
@@ -241,7 +386,6 @@ if __name__ == '__main__':
         sys.exit(130)
     except Exception as e:
         print_error(f"Unexpected error: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 
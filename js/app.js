@@ -358,6 +358,13 @@ async function loadData() {
         const filename = getDataFilename();
         console.log('[DEBUG] Loading file:', filename);
         console.log('[DEBUG] Current filters:', JSON.stringify(currentFilters));
+        
+        if (!customerHasTickets(currentFilters.customer, currentFilters.year)) {
+            console.log('[DEBUG] No tickets for customer in year - skipping fetch');
+            clearDataDisplay();
+            return;
+        }
+        
         const url = getCacheBustingUrl(`data/${filename}`);
         console.log('[DEBUG] Fetching URL:', url);
         const response = await fetch(url);
@@ -374,16 +381,7 @@ async function loadData() {
         
         if (!fileData.data || fileData.data.length === 0) {
             console.warn('[DEBUG] Warning: File loaded but contains no data items - clearing display');
-            // Clear current data and charts immediately
-            currentData = [];
-            updateStatsCards(0, 0);
-            if (createdResolvedChart) {
-                createdResolvedChart.clear();
-            }
-            if (cumulativeChart) {
-                cumulativeChart.clear();
-            }
-            hideLoading();
+            clearDataDisplay();
             return; // Exit early - don't call filterAndRenderData
         }
         
@@ -418,6 +416,34 @@ async function loadData() {
     }
 }
 
+// Clear current data and charts immediately (selection has no tickets)
+function clearDataDisplay() {
+    currentData = [];
+    updateStatsCards(0, 0);
+    if (createdResolvedChart) {
+        createdResolvedChart.clear();
+    }
+    if (cumulativeChart) {
+        cumulativeChart.clear();
+    }
+    hideLoading();
+}
+
+// Check whether a customer has tickets in a year. The generator skips
+// weekly/monthly files for customers without tickets in a year and lists the
+// years that have files in metadata.customer_years; older metadata without
+// it (and the grouped views) always have a file.
+function customerHasTickets(customer, year) {
+    if (!metadata || !metadata.customer_years) {
+        return true;
+    }
+    const years = metadata.customer_years[customer];
+    if (!years) {
+        return true;
+    }
+    return years.includes(Number(year));
+}
+
 // Get filename based on current filters
 function getDataFilename() {
     const period = currentFilters.period;
@@ -5,72 +5,181 @@ This script pre-aggregates data to improve frontend performance.
 
 Usage:
     python3 scripts/process_csv.py
+
+JSON output uses orjson when it is installed (pip install orjson), which is
+several times faster than the standard library encoder and produces
+byte-identical files. Without it the stdlib json module is used.
+Data files read by the dashboard are written compact (no indentation) to
+keep them small; metadata.json stays indented for readability.
 """
 
 import csv
 import json
+import os
 import re
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from operator import attrgetter
 from collections import defaultdict
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _dumps(obj, indent=False):
+        """Serialize obj to UTF-8 JSON bytes, optionally indented (orjson)"""
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+else:
+    def _dumps(obj, indent=False):
+        """Serialize obj to UTF-8 JSON bytes, optionally indented (stdlib fallback)"""
+        if indent:
+            return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+# Worker threads used to serialize and write output files
+EMIT_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
 # Month mapping
 MONTHS = {
     'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
     'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
 }
+# Month abbreviations by month - 1 (what strftime('%b') gives in the C locale)
+MONTH_NAMES = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+# Precompiled patterns for customer name handling
+_BRACKET_RE = re.compile(r'\s*\[.*?\]')
+_ONE_ALBANIA_RE = re.compile(r'one\s+albania', re.IGNORECASE)
+_UNSAFE_FILENAME_RE = re.compile(r'[^a-zA-Z0-9_-]')
+
+# Memoization caches: dates, customer names and One Albania checks repeat
+# heavily across rows, so each distinct value is only parsed once
+_DATE_CACHE = {}
+_CLEAN_NAME_CACHE = {}
+_ONE_ALBANIA_CACHE = {}
 
 def parse_date(date_str):
     """Parse date string from CSV format: '21/Dec/25 8:54 AM'"""
-    if not date_str or not date_str.strip():
+    if not date_str:
         return None
     
+    # Only the date part is used, so cache on it ("21/Dec/25"). Well-formed
+    # cells hit the cache straight from the text before the first space
+    date_part = date_str.partition(' ')[0]
+    if date_part in _DATE_CACHE:
+        return _DATE_CACHE[date_part]
+    
+    # Blank or padded cells: normalize, then look up again
+    date_part = date_str.strip().partition(' ')[0]
+    if not date_part:
+        return None
+    if date_part in _DATE_CACHE:
+        return _DATE_CACHE[date_part]
+    
     try:
-        parts = date_str.strip().split(' ')
-        date_part = parts[0]  # "21/Dec/25"
         day, month_str, year_str = date_part.split('/')
-        year = 2000 + int(year_str)
-        month = MONTHS[month_str]
-        return datetime(year, month, int(day))
+        result = datetime(2000 + int(year_str), MONTHS[month_str], int(day))
     except (ValueError, KeyError) as e:
         print(f"Warning: Failed to parse date '{date_str}': {e}")
-        return None
+        result = None
+    
+    _DATE_CACHE[date_part] = result
+    return result
 
 def clean_customer_name(name):
     """Remove brackets [XXXX] from customer name"""
     if not name:
         return ''
-    return re.sub(r'\s*\[.*?\]', '', name).strip()
+    cleaned = _CLEAN_NAME_CACHE.get(name)
+    if cleaned is None:
+        cleaned = _CLEAN_NAME_CACHE[name] = _BRACKET_RE.sub('', name).strip()
+    return cleaned
 
 def is_one_albania(customer_name):
     """Check if customer name matches One Albania (case-insensitive)"""
     if not customer_name:
         return False
-    return bool(re.search(r'one\s+albania', customer_name, re.IGNORECASE))
+    matched = _ONE_ALBANIA_CACHE.get(customer_name)
+    if matched is None:
+        matched = _ONE_ALBANIA_CACHE[customer_name] = bool(_ONE_ALBANIA_RE.search(customer_name))
+    return matched
 
 def get_quarter(date):
     """Get quarter (1-4) from date"""
-    month = date.month
-    if month <= 3:
-        return 1
-    elif month <= 6:
-        return 2
-    elif month <= 9:
-        return 3
-    else:
-        return 4
+    return (date.month - 1) // 3 + 1
+
+# Week starts per distinct date (tickets share a small set of days)
+_WEEK_START_CACHE = {}
 
 def get_week_start(date):
     """Get Monday of the week for a given date"""
-    days_since_monday = date.weekday()
-    return date - timedelta(days=days_since_monday)
+    week_start = _WEEK_START_CACHE.get(date)
+    if week_start is None:
+        days_since_monday = date.weekday()
+        week_start = _WEEK_START_CACHE[date] = date - timedelta(days=days_since_monday)
+    return week_start
+
+# Date formatting with f-strings: strftime goes through the locale-aware C
+# formatter and is several times slower for these fixed formats
+def format_ymd(date):
+    """Format date as 'YYYY-MM-DD'"""
+    return f"{date.year:04d}-{date.month:02d}-{date.day:02d}"
+
+def format_dmy(date):
+    """Format date as 'DD Mon YYYY' (e.g. '06 Oct 2024')"""
+    return f"{date.day:02d} {MONTH_NAMES[date.month - 1]} {date.year:04d}"
+
+def week_key(date):
+    """Get week bucket key ('YYYY-MM-DD' of the Monday) for a date"""
+    return format_ymd(get_week_start(date))
+
+def month_key(date):
+    """Get month bucket key ('YYYY-MM') for a date"""
+    return f"{date.year:04d}-{date.month:02d}"
+
+# Dense integer ids for week/month buckets. Tickets store bucket ids so the
+# aggregation loop can count into preallocated lists instead of dicts.
+# *_BUCKET_KEYS maps id -> key, *_BUCKET_IDS maps key -> id and the date
+# caches map each distinct date straight to its id.
+WEEK_BUCKET_KEYS = []
+MONTH_BUCKET_KEYS = []
+_WEEK_BUCKET_IDS = {}
+_MONTH_BUCKET_IDS = {}
+_WEEK_BUCKET_CACHE = {}
+_MONTH_BUCKET_CACHE = {}
+
+def _intern_bucket(key, ids, keys):
+    """Return the dense id for a bucket key, assigning the next id if new"""
+    bucket = ids.get(key)
+    if bucket is None:
+        bucket = ids[key] = len(keys)
+        keys.append(key)
+    return bucket
+
+def week_bucket(date):
+    """Get dense id of the week bucket containing date"""
+    bucket = _WEEK_BUCKET_CACHE.get(date)
+    if bucket is None:
+        bucket = _WEEK_BUCKET_CACHE[date] = _intern_bucket(week_key(date), _WEEK_BUCKET_IDS, WEEK_BUCKET_KEYS)
+    return bucket
 
-def get_month_start(date):
-    """Get first day of month"""
-    return datetime(date.year, date.month, 1)
+def month_bucket(date):
+    """Get dense id of the month bucket containing date"""
+    bucket = _MONTH_BUCKET_CACHE.get(date)
+    if bucket is None:
+        bucket = _MONTH_BUCKET_CACHE[date] = _intern_bucket(month_key(date), _MONTH_BUCKET_IDS, MONTH_BUCKET_KEYS)
+    return bucket
 
 def generate_jira_link(issue_keys):
-    """Generate Jira JQL link based on issue keys"""
+    """Generate Jira JQL link based on a set of unique issue keys"""
     base_url = 'https://psskyvera.atlassian.net/issues/?jql='
     
     if not issue_keys:
@@ -78,25 +187,91 @@ def generate_jira_link(issue_keys):
         return f"{base_url}key = \"NONE\""
     
     # Format keys for JQL: key in ('KEY1', 'KEY2', ...)
-    keys_str = ', '.join([f"'{key}'" for key in sorted(set(issue_keys))])
+    keys_str = "'" + "', '".join(sorted(issue_keys)) + "'"
     jql = f"key in ({keys_str}) ORDER BY key DESC"
     return f"{base_url}{jql}"
 
+class Ticket:
+    """One CSV row reduced to the fields used by the aggregations
+
+    Slotted so each of the (many) tickets is a fixed-size record instead of a
+    per-row dict; the week/month fields hold dense bucket ids.
+    """
+    __slots__ = (
+        'created', 'closure', 'customer', 'original_customer', 'issue_key',
+        'status', 'assignee', 'development_completed',
+        'week_created', 'week_resolved', 'month_created', 'month_resolved',
+    )
+    
+    def __init__(self, created, closure, customer, original_customer, issue_key,
+                 status, assignee, development_completed,
+                 week_created, week_resolved, month_created, month_resolved):
+        self.created = created
+        self.closure = closure
+        self.customer = customer
+        self.original_customer = original_customer
+        self.issue_key = issue_key
+        self.status = status
+        self.assignee = assignee
+        self.development_completed = development_completed
+        self.week_created = week_created
+        self.week_resolved = week_resolved
+        self.month_created = month_created
+        self.month_resolved = month_resolved
+
 def process_csv_file(csv_path):
-    """Process CSV file and return structured data"""
+    """Process CSV file and return structured data
+
+    Rows are consumed one at a time from the reader and reduced to compact
+    Ticket records; only the fields used by the aggregations are kept.
+    Week/month bucket ids for the created and closure dates are computed
+    here once, so the per-file aggregations do no date formatting per ticket.
+    """
     tickets = []
     customers = set()
     years = set()
     
     print(f"Reading CSV file: {csv_path}")
     with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        header = next(reader, [])
+        
+        # Resolve column positions once. As with DictReader, the last of any
+        # duplicate header names wins and missing columns read as ''.
+        positions = {name: i for i, name in enumerate(header)}
+        n_columns = len(header)
+        missing = n_columns  # index of the empty cell appended when a column is missing
+        created_idx = positions.get('Created', missing)
+        closure_idx = positions.get('Custom field (Closure Date)', missing)
+        customer_idx = positions.get('Custom field (PS Customer Name)', missing)
+        issue_key_idx = positions.get('Issue key', missing)
+        status_idx = positions.get('Status', missing)
+        assignee_idx = positions.get('Assignee', missing)
+        dev_completed_idx = positions.get('Custom field (Development Completed)', missing)
+        used = (created_idx, closure_idx, customer_idx, issue_key_idx,
+                status_idx, assignee_idx, dev_completed_idx)
+        has_missing = missing in used
+        width = max(used) + 1
+        
         row_count = 0
         for row in reader:
+            if not row:
+                continue  # Skip blank lines (DictReader does the same)
+            if has_missing:
+                # Cells beyond the header are never read as a column
+                # (DictReader files them under its restkey): normalize the
+                # row to the header width, then append the empty cell that
+                # missing columns read
+                if len(row) != n_columns:
+                    del row[n_columns:]
+                    row.extend([''] * (n_columns - len(row)))
+                row.append('')
+            elif len(row) < width:
+                row.extend([''] * (width - len(row)))
             row_count += 1
-            created_date = parse_date(row.get('Created', ''))
-            closure_date = parse_date(row.get('Custom field (Closure Date)', ''))
-            customer_name = row.get('Custom field (PS Customer Name)', '')
+            created_date = parse_date(row[created_idx])
+            closure_date = parse_date(row[closure_idx])
+            customer_name = row[customer_idx]
             cleaned_customer = clean_customer_name(customer_name)
             
             if not created_date:
@@ -107,21 +282,24 @@ def process_csv_file(csv_path):
                 customers.add(cleaned_customer)
             
             # Get Status and Assignee for team performance
-            status = row.get('Status', '').strip()
-            assignee = row.get('Assignee', '').strip()
-            development_completed = parse_date(row.get('Custom field (Development Completed)', ''))
+            status = row[status_idx].strip()
+            assignee = row[assignee_idx].strip()
+            development_completed = parse_date(row[dev_completed_idx])
             
-            tickets.append({
-                'created': created_date,
-                'closure': closure_date,
-                'customer': cleaned_customer,
-                'original_customer': customer_name,
-                'issue_key': row.get('Issue key', ''),
-                'summary': row.get('Summary', ''),
-                'status': status,
-                'assignee': assignee,
-                'development_completed': development_completed
-            })
+            tickets.append(Ticket(
+                created=created_date,
+                closure=closure_date,
+                customer=cleaned_customer,
+                original_customer=customer_name,
+                issue_key=row[issue_key_idx],
+                status=status,
+                assignee=assignee,
+                development_completed=development_completed,
+                week_created=week_bucket(created_date),
+                week_resolved=week_bucket(closure_date) if closure_date else None,
+                month_created=month_bucket(created_date),
+                month_resolved=month_bucket(closure_date) if closure_date else None
+            ))
     
     print(f"Processed {len(tickets)} tickets from {row_count} rows")
     print(f"Found {len(customers)} unique customers")
@@ -133,217 +311,233 @@ def process_csv_file(csv_path):
         'years': sorted(years)
     }
 
-def filter_tickets(tickets, customer_filter=None, year_filter=None):
-    """Filter tickets based on criteria"""
-    filtered = tickets
-    
-    # Filter by customer
-    if customer_filter:
-        if customer_filter == 'one-albania':
-            filtered = [t for t in filtered if is_one_albania(t['original_customer'])]
-        elif customer_filter == 'rest-of-world':
-            filtered = [t for t in filtered if not is_one_albania(t['original_customer'])]
-        else:
-            filtered = [t for t in filtered if t['customer'] == customer_filter]
+def index_tickets(tickets):
+    """Index tickets by year and (customer, one_albania) partition in a single pass
+
+    one_albania is matched on the original customer name, so every
+    weekly/monthly view (a customer, 'all', 'one-albania' or
+    'rest-of-world') is a union of partitions of its year. Returns
+    {year: {(customer, one_albania): tickets}} with tickets in their
+    original order.
+    """
+    by_year = defaultdict(lambda: defaultdict(list))
     
-    # Filter by year
-    if year_filter:
-        filtered = [t for t in filtered if t['created'].year == year_filter]
+    for ticket in tickets:
+        partition = (ticket.customer, is_one_albania(ticket.original_customer))
+        by_year[ticket.created.year][partition].append(ticket)
     
-    return filtered
+    return by_year
 
-def aggregate_weekly(tickets, customer_filter=None):
-    """Aggregate tickets by week"""
-    aggregated = defaultdict(lambda: {
-        'created': 0,
-        'resolved': 0,
-        'created_keys': [],
-        'resolved_keys': []
-    })
-    
-    # First pass: count created tickets per week
+def bucket_counts(tickets, created_field, resolved_field, n_buckets):
+    """Count created/resolved tickets per bucket in a single pass
+
+    created_field and resolved_field name the Ticket attributes holding the
+    precomputed bucket ids (see process_csv_file). A ticket is counted as
+    created in its created bucket and, if closed, as resolved in its closure
+    bucket (regardless of when it was created). Returns dense lists indexed by
+    bucket id: (created, resolved, created_keys, resolved_keys), where the
+    key entries are sets of issue keys or None.
+    """
+    created = [0] * n_buckets
+    resolved = [0] * n_buckets
+    created_keys = [None] * n_buckets
+    resolved_keys = [None] * n_buckets
+    created_bucket = attrgetter(created_field)
+    resolved_bucket = attrgetter(resolved_field)
+    
+    # Tight counting loop over integer bucket ids
     for ticket in tickets:
-        created_date = ticket['created']
-        week_start = get_week_start(created_date)
-        week_key = week_start.strftime('%Y-%m-%d')
-        week_end = week_start + timedelta(days=6)
-        
-        if week_key not in aggregated:
-            aggregated[week_key] = {
-                'week_start': week_start.strftime('%Y-%m-%d'),
-                'week_end': week_end.strftime('%Y-%m-%d'),
-                'label': f"{week_start.strftime('%d %b %Y')} - {week_end.strftime('%d %b %Y')}",
-                'created': 0,
-                'resolved': 0,
-                'created_keys': [],
-                'resolved_keys': []
-            }
+        issue_key = ticket.issue_key
         
         # Track created ticket
-        if ticket['issue_key']:
-            aggregated[week_key]['created_keys'].append(ticket['issue_key'])
-        aggregated[week_key]['created'] += 1
-    
-    # Second pass: count resolved tickets per week (regardless of when created)
-    for ticket in tickets:
-        if ticket['closure']:
-            closure_date = ticket['closure']
-            closure_week_start = get_week_start(closure_date)
-            closure_week_key = closure_week_start.strftime('%Y-%m-%d')
-            closure_week_end = closure_week_start + timedelta(days=6)
-            
-            # Initialize week if it doesn't exist (for tickets resolved but not created in this period)
-            if closure_week_key not in aggregated:
-                aggregated[closure_week_key] = {
-                    'week_start': closure_week_start.strftime('%Y-%m-%d'),
-                    'week_end': closure_week_end.strftime('%Y-%m-%d'),
-                    'label': f"{closure_week_start.strftime('%d %b %Y')} - {closure_week_end.strftime('%d %b %Y')}",
-                    'created': 0,
-                    'resolved': 0,
-                    'created_keys': [],
-                    'resolved_keys': []
-                }
-            
-            # Track resolved ticket
-            if ticket['issue_key']:
-                aggregated[closure_week_key]['resolved_keys'].append(ticket['issue_key'])
-            aggregated[closure_week_key]['resolved'] += 1
-    
-    # Convert to sorted list and generate Jira links
-    result = []
-    for key in sorted(aggregated.keys()):
-        item = aggregated[key]
-        # Generate Jira links based on issue keys
-        item['jira_links'] = {
-            'created': generate_jira_link(item['created_keys']),
-            'resolved': generate_jira_link(item['resolved_keys'])
-        }
-        # Remove keys from output (not needed in JSON)
-        del item['created_keys']
-        del item['resolved_keys']
-        result.append(item)
+        bucket = created_bucket(ticket)
+        created[bucket] += 1
+        if issue_key:
+            keys = created_keys[bucket]
+            if keys is None:
+                created_keys[bucket] = {issue_key}
+            else:
+                keys.add(issue_key)
+        
+        # Track resolved ticket
+        bucket = resolved_bucket(ticket)
+        if bucket is not None:
+            resolved[bucket] += 1
+            if issue_key:
+                keys = resolved_keys[bucket]
+                if keys is None:
+                    resolved_keys[bucket] = {issue_key}
+                else:
+                    keys.add(issue_key)
+    
+    return created, resolved, created_keys, resolved_keys
+
+def merge_bucket_counts(parts, n_buckets):
+    """Combine bucket_counts of disjoint ticket partitions into one"""
+    if len(parts) == 1:
+        return parts[0]
+    
+    created = [0] * n_buckets
+    resolved = [0] * n_buckets
+    created_keys = [None] * n_buckets
+    resolved_keys = [None] * n_buckets
+    
+    for part_created, part_resolved, part_created_keys, part_resolved_keys in parts:
+        for bucket in range(n_buckets):
+            created[bucket] += part_created[bucket]
+            resolved[bucket] += part_resolved[bucket]
+            keys = part_created_keys[bucket]
+            if keys:
+                if created_keys[bucket] is None:
+                    created_keys[bucket] = set(keys)
+                else:
+                    created_keys[bucket].update(keys)
+            keys = part_resolved_keys[bucket]
+            if keys:
+                if resolved_keys[bucket] is None:
+                    resolved_keys[bucket] = set(keys)
+                else:
+                    resolved_keys[bucket].update(keys)
+    
+    return created, resolved, created_keys, resolved_keys
+
+def _bucket_items(counts, bucket_keys):
+    """Map bucket_counts to {bucket_key: {'created', 'resolved', 'created_keys', 'resolved_keys'}}"""
+    created, resolved, created_keys, resolved_keys = counts
+    
+    # Materialize only the buckets that occur
+    aggregated = {}
+    for bucket in range(len(bucket_keys)):
+        if created[bucket] or resolved[bucket]:
+            aggregated[bucket_keys[bucket]] = {
+                'created': created[bucket],
+                'resolved': resolved[bucket],
+                'created_keys': created_keys[bucket] or set(),
+                'resolved_keys': resolved_keys[bucket] or set()
+            }
     
-    # Second pass: calculate cumulative (net change per period, starting from 0)
+    return aggregated
+
+def _add_cumulative(result):
+    """Add cumulative net change (created - resolved, starting from 0) to each item"""
     cumulative = 0
     for item in result:
         net_change = item['created'] - item['resolved']
         cumulative += net_change
         item['cumulative'] = cumulative
-    
     return result
 
-def aggregate_monthly(tickets, customer_filter=None):
-    """Aggregate tickets by month"""
-    aggregated = defaultdict(lambda: {
-        'created': 0,
-        'resolved': 0,
-        'created_keys': [],
-        'resolved_keys': []
-    })
+def weekly_data(counts):
+    """Build the weekly data items from bucket_counts over the week buckets"""
+    aggregated = _bucket_items(counts, WEEK_BUCKET_KEYS)
     
-    # First pass: count created tickets per month
-    for ticket in tickets:
-        created_date = ticket['created']
-        month_start = get_month_start(created_date)
-        month_key = month_start.strftime('%Y-%m')
+    # Convert to sorted list; labels are only built for weeks that occur
+    result = []
+    for key in sorted(aggregated.keys()):
+        item_counts = aggregated[key]
+        week_start = datetime(int(key[:4]), int(key[5:7]), int(key[8:10]))
+        week_end = week_start + timedelta(days=6)
+        result.append({
+            'week_start': key,
+            'week_end': format_ymd(week_end),
+            'label': f"{format_dmy(week_start)} - {format_dmy(week_end)}",
+            'created': item_counts['created'],
+            'resolved': item_counts['resolved'],
+            # Generate Jira links based on issue keys
+            'jira_links': {
+                'created': generate_jira_link(item_counts['created_keys']),
+                'resolved': generate_jira_link(item_counts['resolved_keys'])
+            }
+        })
+    
+    return _add_cumulative(result)
+
+def monthly_data(counts):
+    """Build the monthly data items from bucket_counts over the month buckets"""
+    aggregated = _bucket_items(counts, MONTH_BUCKET_KEYS)
+    
+    # Convert to sorted list; labels are only built for months that occur
+    result = []
+    for key in sorted(aggregated.keys()):
+        item_counts = aggregated[key]
+        month_start = datetime(int(key[:4]), int(key[5:7]), 1)
         # Get last day of month
         if month_start.month == 12:
             month_end = datetime(month_start.year + 1, 1, 1) - timedelta(days=1)
         else:
             month_end = datetime(month_start.year, month_start.month + 1, 1) - timedelta(days=1)
-        
-        if month_key not in aggregated:
-            aggregated[month_key] = {
-                'month': month_key,
-                'month_start': month_start.strftime('%Y-%m-%d'),
-                'month_end': month_end.strftime('%Y-%m-%d'),
-                'label': month_start.strftime('%b %Y'),
-                'created': 0,
-                'resolved': 0,
-                'created_keys': [],
-                'resolved_keys': []
+        result.append({
+            'month': key,
+            'month_start': format_ymd(month_start),
+            'month_end': format_ymd(month_end),
+            'label': f"{MONTH_NAMES[month_start.month - 1]} {month_start.year:04d}",
+            'created': item_counts['created'],
+            'resolved': item_counts['resolved'],
+            # Generate Jira links based on issue keys
+            'jira_links': {
+                'created': generate_jira_link(item_counts['created_keys']),
+                'resolved': generate_jira_link(item_counts['resolved_keys'])
             }
-        
-        # Track created ticket
-        if ticket['issue_key']:
-            aggregated[month_key]['created_keys'].append(ticket['issue_key'])
-        aggregated[month_key]['created'] += 1
-    
-    # Second pass: count resolved tickets per month (regardless of when created)
-    for ticket in tickets:
-        if ticket['closure']:
-            closure_date = ticket['closure']
-            closure_month_start = get_month_start(closure_date)
-            closure_month_key = closure_month_start.strftime('%Y-%m')
-            # Get last day of month
-            if closure_month_start.month == 12:
-                closure_month_end = datetime(closure_month_start.year + 1, 1, 1) - timedelta(days=1)
-            else:
-                closure_month_end = datetime(closure_month_start.year, closure_month_start.month + 1, 1) - timedelta(days=1)
-            
-            # Initialize month if it doesn't exist (for tickets resolved but not created in this period)
-            if closure_month_key not in aggregated:
-                aggregated[closure_month_key] = {
-                    'month': closure_month_key,
-                    'month_start': closure_month_start.strftime('%Y-%m-%d'),
-                    'month_end': closure_month_end.strftime('%Y-%m-%d'),
-                    'label': closure_month_start.strftime('%b %Y'),
-                    'created': 0,
-                    'resolved': 0,
-                    'created_keys': [],
-                    'resolved_keys': []
-                }
-            
-            # Track resolved ticket
-            if ticket['issue_key']:
-                aggregated[closure_month_key]['resolved_keys'].append(ticket['issue_key'])
-            aggregated[closure_month_key]['resolved'] += 1
-    
-    # Convert to sorted list and generate Jira links
-    result = []
-    for key in sorted(aggregated.keys()):
-        item = aggregated[key]
-        # Generate Jira links based on issue keys
-        item['jira_links'] = {
-            'created': generate_jira_link(item['created_keys']),
-            'resolved': generate_jira_link(item['resolved_keys'])
-        }
-        # Remove keys from output (not needed in JSON)
-        del item['created_keys']
-        del item['resolved_keys']
-        result.append(item)
-    
-    # Second pass: calculate cumulative (net change per period, starting from 0)
-    cumulative = 0
-    for item in result:
-        net_change = item['created'] - item['resolved']
-        cumulative += net_change
-        item['cumulative'] = cumulative
+        })
     
-    return result
+    return _add_cumulative(result)
 
 def calculate_customer_ticket_counts(tickets, year, quarters):
     """Calculate ticket counts per customer for specific year and quarters"""
     customer_counts = defaultdict(int)
+    quarters = set(quarters)
     
     for ticket in tickets:
-        created_date = ticket['created']
+        created_date = ticket.created
         if created_date.year != year:
             continue
         
-        month = created_date.month
-        quarter = (month - 1) // 3 + 1
-        
-        if quarter in quarters:
-            customer = ticket['customer']
+        if get_quarter(created_date) in quarters:
+            customer = ticket.customer
             if customer:
                 customer_counts[customer] += 1
     
     return customer_counts
 
-def aggregate_customer_distribution(tickets, year, ranges):
-    """Aggregate customer distribution for a specific year and quarter ranges"""
-    customer_counts = defaultdict(int)
+def group_distribution_counts(tickets):
+    """Group ticket counts by (year, month) in a single pass over all tickets
+
+    Returns (customer_months, one_albania_months) where customer_months maps
+    (year, month) -> {customer: [first_seen_index, count]} for non One Albania
+    customers and one_albania_months maps (year, month) -> count. The first
+    seen index keeps customer order identical to a sequential scan.
+    """
+    customer_months = defaultdict(dict)
+    one_albania_months = defaultdict(int)
+    
+    for index, ticket in enumerate(tickets):
+        created_date = ticket.created
+        year_month = (created_date.year, created_date.month)
+        
+        customer = ticket.customer
+        # Skip One Albania variants (they're grouped separately)
+        if customer and not is_one_albania(customer):
+            counts = customer_months[year_month]
+            entry = counts.get(customer)
+            if entry is None:
+                counts[customer] = [index, 1]
+            else:
+                entry[1] += 1
+        
+        if is_one_albania(ticket.original_customer):
+            one_albania_months[year_month] += 1
+    
+    return customer_months, one_albania_months
+
+def aggregate_customer_distribution(tickets, year, ranges, grouped=None):
+    """Aggregate customer distribution for a specific year and quarter ranges
+
+    grouped is the result of group_distribution_counts(tickets); pass it when
+    building several distributions so the tickets are only scanned once.
+    """
+    if grouped is None:
+        grouped = group_distribution_counts(tickets)
+    customer_months, one_albania_months = grouped
     
     # Define quarter month ranges
     quarter_months = {
@@ -363,37 +557,23 @@ def aggregate_customer_distribution(tickets, year, ranges):
                 included_months.extend(quarter_months[range_name])
         included_months = sorted(set(included_months))
     
-    # Count tickets per customer
-    for ticket in tickets:
-        created_date = ticket['created']
-        if created_date.year != year:
-            continue
-        
-        if created_date.month not in included_months:
-            continue
-        
-        customer = ticket['customer']
-        if customer:
-            # Skip One Albania variants (they're grouped separately)
-            if not is_one_albania(customer):
-                customer_counts[customer] += 1
-    
-    # Also count ONE Albania separately
+    # Merge the per-month counts of the included months
+    customer_counts = {}
     one_albania_count = 0
-    for ticket in tickets:
-        created_date = ticket['created']
-        if created_date.year != year:
-            continue
-        
-        if created_date.month not in included_months:
-            continue
-        
-        if is_one_albania(ticket['original_customer']):
-            one_albania_count += 1
+    for month in included_months:
+        year_month = (year, month)
+        for customer, (first_seen, count) in customer_months.get(year_month, {}).items():
+            entry = customer_counts.get(customer)
+            if entry is None:
+                customer_counts[customer] = [first_seen, count]
+            else:
+                entry[0] = min(entry[0], first_seen)
+                entry[1] += count
+        one_albania_count += one_albania_months.get(year_month, 0)
     
-    # Convert to dictionary format
+    # Convert to dictionary format (customers in order of first appearance)
     result = {}
-    for customer, count in customer_counts.items():
+    for customer, (_, count) in sorted(customer_counts.items(), key=lambda item: item[1][0]):
         if count > 0:
             result[customer] = count
     
@@ -441,13 +621,13 @@ def aggregate_team_performance(tickets, year, quarter):
     
     for ticket in tickets:
         # Filter: must have Closure Date (matches Created vs Resolved chart logic)
-        closure_date = ticket.get('closure')
+        closure_date = ticket.closure
         if not closure_date:
             continue
         
         # Filter by creation year (matches Created vs Resolved chart logic)
         # Created vs Resolved filters tickets by created.year before aggregating
-        created_date = ticket.get('created')
+        created_date = ticket.created
         if not created_date or created_date.year != year:
             continue
         
@@ -464,18 +644,17 @@ def aggregate_team_performance(tickets, year, quarter):
             continue
         
         # Get assignee (or "Unassigned")
-        assignee = ticket.get('assignee', '').strip() or 'Unassigned'
+        assignee = ticket.assignee.strip() or 'Unassigned'
         
         # Format week as "DD MMM YYYY" (e.g., "06 Oct 2024")
-        # Note: %b gives abbreviated month name (Jan, Feb, etc.)
-        week_str = week_start.strftime('%d %b %Y')
+        week_str = format_dmy(week_start)
         
         # Get issue key
-        issue_key = ticket.get('issue_key', '')
+        issue_key = ticket.issue_key
         
         # Aggregate
         assignee_week_data[assignee][week_str]['count'] += 1
-        issue_key = ticket.get('issue_key', '')
+        issue_key = ticket.issue_key
         if issue_key:
             assignee_week_data[assignee][week_str]['keys'].append(issue_key)
         assignee_totals[assignee] += 1
@@ -484,7 +663,7 @@ def aggregate_team_performance(tickets, year, quarter):
         all_assignees.add(assignee)
     
     # Sort weeks chronologically
-    sorted_weeks = sorted(all_weeks, key=lambda w: datetime.strptime(w, '%d %b %Y'))
+    sorted_weeks = sorted(all_weeks, key=lambda w: (int(w[7:]), MONTHS[w[3:6]], int(w[:2])))
     
     # Sort assignees: "Unassigned" last, then alphabetically
     sorted_assignees = sorted(
@@ -522,6 +701,103 @@ def aggregate_team_performance(tickets, year, quarter):
         'grand_total': grand_total
     }
 
+def _write_json(filepath, obj, indent=False):
+    """Serialize obj and write it to filepath as UTF-8 JSON"""
+    filepath.write_bytes(_dumps(obj, indent))
+
+# Bucket id fields and bucket key tables per period
+PERIOD_BUCKETS = {
+    'weekly': ('week_created', 'week_resolved', WEEK_BUCKET_KEYS),
+    'monthly': ('month_created', 'month_resolved', MONTH_BUCKET_KEYS),
+}
+
+def period_jobs(by_year, years, file_customers):
+    """List ((period, year, kind, customer), counts) for every weekly/monthly file
+
+    Each (customer, one_albania) partition of a year is counted once per
+    period; customer and group files then merge the counts of their
+    partitions instead of re-counting tickets. file_customers are the
+    customers that get their own files (One Albania variants are only
+    covered by the group files); a customer without tickets in a year gets
+    no file for it (see customer_years and remove_stale_period_files).
+    Tickets without a customer only contribute to the group files.
+    """
+    jobs = []
+    for year in years:
+        partitions = by_year.get(year, {})
+        for period in ['weekly', 'monthly']:
+            created_field, resolved_field, bucket_keys = PERIOD_BUCKETS[period]
+            n_buckets = len(bucket_keys)
+            part_counts = {
+                partition: bucket_counts(part_tickets, created_field, resolved_field, n_buckets)
+                for partition, part_tickets in partitions.items()
+            }
+            
+            groups = {
+                'all': list(part_counts.values()),
+                'one-albania': [c for (_, one_albania), c in part_counts.items() if one_albania],
+                'rest-of-world': [c for (_, one_albania), c in part_counts.items() if not one_albania],
+            }
+            for group in ['all', 'one-albania', 'rest-of-world']:
+                jobs.append(((period, year, 'group', group), merge_bucket_counts(groups[group], n_buckets)))
+            
+            # Individual customers
+            for customer in file_customers:
+                parts = [part_counts[p] for p in ((customer, False), (customer, True)) if p in part_counts]
+                if not parts:
+                    continue
+                jobs.append(((period, year, 'customer', customer), merge_bucket_counts(parts, n_buckets)))
+    
+    return jobs
+
+def customer_years(by_year, file_customers):
+    """Map each file customer to the sorted years it has tickets in
+
+    Stored in metadata.json so the dashboard knows which weekly/monthly
+    files period_jobs skipped as empty without requesting them.
+    """
+    file_customer_set = set(file_customers)
+    years_by_customer = {customer: [] for customer in file_customers}
+    for year in sorted(by_year):
+        for customer, _ in by_year[year]:
+            if customer in file_customer_set:
+                years = years_by_customer[customer]
+                if not years or years[-1] != year:
+                    years.append(year)
+    return years_by_customer
+
+def period_filename(period, year, kind, customer):
+    """Get the output filename of a weekly/monthly file"""
+    if kind == 'group':
+        safe_customer = customer
+    else:
+        # Sanitize customer name for filename
+        safe_customer = _UNSAFE_FILENAME_RE.sub('_', customer)[:50]
+    return f'{period}-{year}-{safe_customer}.json'
+
+def remove_stale_period_files(output_dir, years, file_customers, written):
+    """Delete customer weekly/monthly files of earlier runs that this run skipped as empty
+
+    written holds the filenames generated by this run; any other customer
+    file for these years would otherwise keep serving outdated data.
+    """
+    for year in years:
+        for period in ['weekly', 'monthly']:
+            for customer in file_customers:
+                filename = period_filename(period, year, 'customer', customer)
+                if filename not in written:
+                    (output_dir / filename).unlink(missing_ok=True)
+
+def build_period_file(job, counts):
+    """Build (filename, payload) for one weekly/monthly output file from its bucket counts"""
+    period, year, _, customer = job
+    return period_filename(*job), {
+        'period': period,
+        'year': year,
+        'customer': customer,
+        'data': weekly_data(counts) if period == 'weekly' else monthly_data(counts)
+    }
+
 def generate_all_aggregations(data, output_dir):
     """Generate all possible aggregation combinations"""
     output_dir = Path(output_dir)
@@ -546,160 +822,101 @@ def generate_all_aggregations(data, output_dir):
     
     sorted_customers = sorted(customers, key=sort_key)
     
+    # Classify customers once; everything below uses set membership
+    one_albania_set = {c for c in customers if is_one_albania(c)}
+    file_customers = [c for c in customers if c not in one_albania_set]
+    
+    # Index tickets once by year and (customer, One Albania) partition
+    by_year = index_tickets(tickets)
+    
     # Generate metadata
-    one_albania_customers = [c for c in sorted_customers if is_one_albania(c)]
+    one_albania_customers = [c for c in sorted_customers if c in one_albania_set]
     metadata = {
         'customers': sorted_customers,  # Use sorted list
         'years': years,
         'one_albania_customers': one_albania_customers,
         'total_tickets': len(tickets),
-        'customer_ticket_counts_q3_q4_2025': customer_ticket_counts  # Store counts for reference
+        'customer_ticket_counts_q3_q4_2025': customer_ticket_counts,  # Store counts for reference
+        'customer_years': customer_years(by_year, file_customers)  # Years with weekly/monthly files
     }
     
-    metadata_path = output_dir / 'metadata.json'
-    with open(metadata_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2, ensure_ascii=False)
-    print(f"Generated: metadata.json")
-    
-    file_count = 1
-    
-    # Generate aggregations for each combination
-    for year in years:
-        for period in ['weekly', 'monthly']:
-            # All customers
-            filtered = filter_tickets(tickets, year_filter=year)
-            if period == 'weekly':
-                aggregated = aggregate_weekly(filtered, customer_filter=None)
-            else:
-                aggregated = aggregate_monthly(filtered, customer_filter=None)
-            
-            filename = f'{period}-{year}-all.json'
-            filepath = output_dir / filename
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'period': period,
-                    'year': year,
-                    'customer': 'all',
-                    'data': aggregated
-                }, f, indent=2, ensure_ascii=False)
-            file_count += 1
-            
-            # One Albania
-            filtered = filter_tickets(tickets, customer_filter='one-albania', year_filter=year)
-            if period == 'weekly':
-                aggregated = aggregate_weekly(filtered, customer_filter='one-albania')
-            else:
-                aggregated = aggregate_monthly(filtered, customer_filter='one-albania')
-            
-            filename = f'{period}-{year}-one-albania.json'
-            filepath = output_dir / filename
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'period': period,
-                    'year': year,
-                    'customer': 'one-albania',
-                    'data': aggregated
-                }, f, indent=2, ensure_ascii=False)
-            file_count += 1
-            
-            # Rest of World
-            filtered = filter_tickets(tickets, customer_filter='rest-of-world', year_filter=year)
-            if period == 'weekly':
-                aggregated = aggregate_weekly(filtered, customer_filter='rest-of-world')
-            else:
-                aggregated = aggregate_monthly(filtered, customer_filter='rest-of-world')
-            
-            filename = f'{period}-{year}-rest-of-world.json'
-            filepath = output_dir / filename
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'period': period,
-                    'year': year,
-                    'customer': 'rest-of-world',
-                    'data': aggregated
-                }, f, indent=2, ensure_ascii=False)
-            file_count += 1
-            
-            # Individual customers (excluding One Albania variants)
-            for customer in customers:
-                if not is_one_albania(customer):
-                    filtered = filter_tickets(tickets, customer_filter=customer, year_filter=year)
-                    if period == 'weekly':
-                        aggregated = aggregate_weekly(filtered, customer_filter=customer)
-                    else:
-                        aggregated = aggregate_monthly(filtered, customer_filter=customer)
-                    
-                    # Sanitize customer name for filename
-                    safe_customer = re.sub(r'[^a-zA-Z0-9_-]', '_', customer)[:50]
-                    filename = f'{period}-{year}-{safe_customer}.json'
-                    filepath = output_dir / filename
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        json.dump({
-                            'period': period,
-                            'year': year,
-                            'customer': customer,
-                            'data': aggregated
-                        }, f, indent=2, ensure_ascii=False)
-                    file_count += 1
-    
-    # Generate customer distribution aggregations (for pie chart)
-    print(f"\nGenerating customer distribution aggregations...")
-    for year in years:
-        # Generate for each quarter
-        for quarter in ['Q1', 'Q2', 'Q3', 'Q4']:
-            distribution = aggregate_customer_distribution(tickets, year, [quarter])
-            filename = f'customer-distribution-{year}-{quarter}.json'
-            filepath = output_dir / filename
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump({
+    # Each output file is independent: serialize and write them on a thread
+    # pool so file I/O overlaps with building the next aggregation
+    futures = []
+    latest_writes = {}  # filename -> future of its most recent write
+    with ThreadPoolExecutor(max_workers=EMIT_WORKERS) as pool:
+        def emit(filename, obj, indent=False):
+            # Names can collide (customers whose sanitized names match, or a
+            # customer named like a group file). Finish the earlier write
+            # first so the last one emitted wins, as with serial writes
+            previous = latest_writes.get(filename)
+            if previous is not None:
+                previous.result()
+            future = latest_writes[filename] = pool.submit(_write_json, output_dir / filename, obj, indent)
+            futures.append(future)
+        
+        emit('metadata.json', metadata, indent=True)
+        print(f"Generated: metadata.json")
+        
+        # Count each (customer, One Albania) partition once; weekly/monthly
+        # files dominate the output and each becomes a job that only formats
+        # its merged counts
+        written = set()
+        for job, counts in period_jobs(by_year, years, file_customers):
+            filename, payload = build_period_file(job, counts)
+            written.add(filename)
+            emit(filename, payload)
+        remove_stale_period_files(output_dir, years, file_customers, written)
+        
+        # Generate customer distribution aggregations (for pie chart)
+        print(f"\nGenerating customer distribution aggregations...")
+        distribution_counts = group_distribution_counts(tickets)
+        for year in years:
+            # Generate for each quarter
+            for quarter in ['Q1', 'Q2', 'Q3', 'Q4']:
+                distribution = aggregate_customer_distribution(tickets, year, [quarter], distribution_counts)
+                emit(f'customer-distribution-{year}-{quarter}.json', {
                     'year': year,
                     'range': quarter,
                     'distribution': distribution
-                }, f, indent=2, ensure_ascii=False)
-            file_count += 1
-        
-        # Generate for Annual
-        distribution = aggregate_customer_distribution(tickets, year, ['Annual'])
-        filename = f'customer-distribution-{year}-Annual.json'
-        filepath = output_dir / filename
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump({
+                })
+            
+            # Generate for Annual
+            distribution = aggregate_customer_distribution(tickets, year, ['Annual'], distribution_counts)
+            emit(f'customer-distribution-{year}-Annual.json', {
                 'year': year,
                 'range': 'Annual',
                 'distribution': distribution
-            }, f, indent=2, ensure_ascii=False)
-        file_count += 1
-        
-        # Generate for combined quarters (Q1+Q2, Q1+Q3, Q1+Q4, Q2+Q3, Q2+Q4, Q3+Q4, Q1+Q2+Q3, Q1+Q2+Q4, Q1+Q3+Q4, Q2+Q3+Q4)
-        combined_ranges = [
-            ['Q1', 'Q2'], ['Q1', 'Q3'], ['Q1', 'Q4'],
-            ['Q2', 'Q3'], ['Q2', 'Q4'], ['Q3', 'Q4'],
-            ['Q1', 'Q2', 'Q3'], ['Q1', 'Q2', 'Q4'], ['Q1', 'Q3', 'Q4'], ['Q2', 'Q3', 'Q4']
-        ]
-        for ranges in combined_ranges:
-            distribution = aggregate_customer_distribution(tickets, year, ranges)
-            range_key = '+'.join(sorted(ranges))
-            filename = f'customer-distribution-{year}-{range_key}.json'
-            filepath = output_dir / filename
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump({
+            })
+            
+            # Generate for combined quarters (Q1+Q2, Q1+Q3, Q1+Q4, Q2+Q3, Q2+Q4, Q3+Q4, Q1+Q2+Q3, Q1+Q2+Q4, Q1+Q3+Q4, Q2+Q3+Q4)
+            combined_ranges = [
+                ['Q1', 'Q2'], ['Q1', 'Q3'], ['Q1', 'Q4'],
+                ['Q2', 'Q3'], ['Q2', 'Q4'], ['Q3', 'Q4'],
+                ['Q1', 'Q2', 'Q3'], ['Q1', 'Q2', 'Q4'], ['Q1', 'Q3', 'Q4'], ['Q2', 'Q3', 'Q4']
+            ]
+            for ranges in combined_ranges:
+                distribution = aggregate_customer_distribution(tickets, year, ranges, distribution_counts)
+                range_key = '+'.join(sorted(ranges))
+                emit(f'customer-distribution-{year}-{range_key}.json', {
                     'year': year,
                     'range': range_key,
                     'distribution': distribution
-                }, f, indent=2, ensure_ascii=False)
-            file_count += 1
-    
-    # Generate team performance data for each (year, quarter) combination
-    print("\nGenerating team performance data...")
-    for year in years:
-        for quarter in [1, 2, 3, 4]:
-            team_data = aggregate_team_performance(tickets, year, quarter)
-            filename = f'team-performance-{year}-Q{quarter}.json'
-            filepath = output_dir / filename
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(team_data, f, indent=2, ensure_ascii=False)
-            file_count += 1
-            print(f"Generated: {filename}")
+                })
+        
+        # Generate team performance data for each (year, quarter) combination
+        print("\nGenerating team performance data...")
+        for year in years:
+            for quarter in [1, 2, 3, 4]:
+                team_data = aggregate_team_performance(tickets, year, quarter)
+                filename = f'team-performance-{year}-Q{quarter}.json'
+                emit(filename, team_data)
+                print(f"Generated: {filename}")
+    
+    # Surface any write error and count the files actually written
+    for future in futures:
+        future.result()
+    file_count = len(futures)
     
     print(f"\nGenerated {file_count} JSON files in {output_dir}")
     return file_count
@@ -722,7 +939,6 @@ def main():
         return 0
     except Exception as e:
         print(f"\n❌ Error: {e}")
-        import traceback
         traceback.print_exc()
         return 1
 